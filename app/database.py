@@ -1,75 +1,187 @@
 from dotenv import load_dotenv, find_dotenv
+import asyncio
 import os
-import mysql.connector
-from typing import List, Dict, Any, cast
-from mysql.connector.cursor import MySQLCursorDict
+import time
+import asyncmy
+import orjson
+from asyncmy.cursors import DictCursor
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, TypedDict, cast
 
 # Carga .env desde la raíz
 load_dotenv(find_dotenv())
 
-def get_connection():
+
+# Compartida por insert_producto y bulk_insert_productos: el texto es la clave
+# de la caché de sentencias preparadas, así ambas usan el mismo handle
+_SQL_INSERT_PRODUCTO = (
+    "INSERT INTO productos (nombre, categoria, precio, stock, descripcion) "
+    "VALUES (%s, %s, %s, %s, %s)"
+)
+
+
+class ProductoRow(TypedDict):
+    """
+    Fila de `productos` con la misma forma que la respuesta JSON de la API.
+    """
+    id: int
+    nombre: str
+    categoria: str
+    precio: float
+    stock: int
+    descripcion: str | None
+
+
+def _a_producto_row(row: Dict[str, Any]) -> ProductoRow:
+    """
+    Adapta una fila del DictCursor al contrato de la API.
+    DECIMAL llega como Decimal; se pasa a float para serializar directo.
+    """
+    row["precio"] = float(row["precio"])
+    return cast(ProductoRow, row)
+
+
+# Pool de conexiones compartido por todos los endpoints
+_pool: asyncmy.Pool | None = None
+# Evita que dos peticiones simultáneas creen cada una su propio pool
+_pool_lock = asyncio.Lock()
+
+# Cachés de lectura. Cada worker tiene las suyas y solo se invalidan en el que
+# atiende la escritura, así que DB_CACHE_TTL (segundos) acota lo que otro
+# worker puede seguir sirviendo un dato obsoleto. 0 desactiva ambas cachés.
+_CACHE_TTL = float(os.getenv("DB_CACHE_TTL", "5"))
+# Productos por ID (LRU). Con TTL 0 nunca se llena; TTLCache solo necesita un ttl positivo
+_producto_cache: TTLCache[int, ProductoRow] = TTLCache(maxsize=1024, ttl=_CACHE_TTL or 1)
+# JSON ya serializado del listado completo y momento en que se generó
+_listado_cache: bytes | None = None
+_listado_cache_ts = 0.0
+# Se incrementa en cada escritura para no cachear lecturas que se solapan con ella
+_cache_version = 0
+
+
+def _invalidar_caches(producto_id: int | None = None) -> None:
+    """
+    Descarta el listado cacheado y, si se indica, el producto modificado o borrado.
+    """
+    global _listado_cache, _cache_version
+    _listado_cache = None
+    if producto_id is not None:
+        _producto_cache.pop(producto_id, None)
+    _cache_version += 1
+
+
+async def init_pool() -> asyncmy.Pool:
+    """
+    Crea el pool de conexiones a MySQL si todavía no existe.
+    Con todas las conexiones en uso, las peticiones esperan a que se libere
+    una en lugar de fallar.
+    """
+    global _pool
+    if _pool is not None:
+        return _pool
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await asyncmy.create_pool(
+                host=os.getenv("DB_HOST", "localhost"),
+                user=os.getenv("DB_USER", "root"),
+                password=os.getenv("DB_PASSWORD", ""),
+                db=os.getenv("DB_NAME", "glowy_db"),
+                port=int(os.getenv("DB_PORT", "3306")),
+                charset="utf8mb4",
+                maxsize=int(os.getenv("DB_POOL_SIZE", "25")),
+                # Cada sentencia se confirma sola; una conexión con una
+                # transacción abierta no podría devolverse al pool
+                autocommit=True,
+                # Renueva conexiones antes de que MySQL las cierre por inactividad
+                pool_recycle=3600,
+                # Cada conexión prepara en el servidor las sentencias con parámetros
+                # la primera vez y reutiliza el handle en las siguientes llamadas
+                stmt_cache_size=16
+            )
+    return _pool
+
+
+async def close_pool() -> None:
     """
-    Crea y retorna una conexión a la base de datos MySQL.
+    Cierra todas las conexiones del pool y lo descarta.
     """
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        user=os.getenv("DB_USER", "root"),
-        password=os.getenv("DB_PASSWORD", ""),
-        database=os.getenv("DB_NAME", "glowy_db"),
-        port=int(os.getenv("DB_PORT", "3306")),
-        charset="utf8mb4"
-    )
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        await _pool.wait_closed()
+        _pool = None
 
 
-def fetch_all_productos() -> List[Dict[str, Any]]:
+@asynccontextmanager
+async def get_connection() -> AsyncIterator[asyncmy.Connection]:
     """
-    Ejecuta SELECT * FROM productos y devuelve una lista de dicts.
+    Toma una conexión del pool y la devuelve al salir del bloque `async with`.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cur: MySQLCursorDict
-        cur = conn.cursor(dictionary=True)  # type: ignore[assignment]
-        try:
-            cur.execute(
+    pool = await init_pool()
+    async with pool.acquire() as conn:
+        yield conn
+
+
+async def fetch_all_productos() -> List[ProductoRow]:
+    """
+    Ejecuta SELECT * FROM productos y devuelve una lista de dicts
+    con la misma forma que la respuesta de la API.
+    """
+    async with get_connection() as conn:
+        async with conn.cursor(DictCursor) as cur:
+            await cur.execute(
                 "SELECT id, nombre, categoria, precio, stock, descripcion FROM productos;"
             )
-            rows = cast(List[Dict[str, Any]], cur.fetchall())
-            return rows
-        finally:
-            cur.close()
-    finally:
-        if conn:
-            conn.close()
+            rows = cast(List[Dict[str, Any]], await cur.fetchall())
+            return [_a_producto_row(row) for row in rows]
 
 
-def fetch_producto_by_id(producto_id: int) -> Dict[str, Any] | None:
+async def fetch_all_productos_json() -> bytes:
+    """
+    Devuelve el listado completo ya serializado con orjson.
+    El JSON se reutiliza durante DB_CACHE_TTL segundos o hasta la próxima escritura.
     """
-    Obtiene un producto por su ID.
+    global _listado_cache, _listado_cache_ts
+    if _listado_cache is not None and time.monotonic() - _listado_cache_ts < _CACHE_TTL:
+        return _listado_cache
+
+    version = _cache_version
+    contenido = orjson.dumps(await fetch_all_productos())
+    if _CACHE_TTL > 0 and version == _cache_version:
+        _listado_cache = contenido
+        _listado_cache_ts = time.monotonic()
+    return contenido
+
+
+async def fetch_producto_by_id(producto_id: int) -> ProductoRow | None:
+    """
+    Obtiene un producto por su ID (primero en caché y si no en la BD).
     Retorna un dict con los datos del producto o None si no existe.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cur: MySQLCursorDict
-        cur = conn.cursor(dictionary=True)  # type: ignore[assignment]
-        try:
-            cur.execute(
+    cached = _producto_cache.get(producto_id)
+    if cached is not None:
+        return cached.copy()
+
+    version = _cache_version
+    async with get_connection() as conn:
+        async with conn.cursor(DictCursor) as cur:
+            await cur.execute(
                 "SELECT id, nombre, categoria, precio, stock, descripcion FROM productos WHERE id = %s",
                 (producto_id,)
             )
-            result = cur.fetchone()
-            return dict(result) if result else None
-        finally:
-            cur.close()
-    finally:
-        if conn:
-            conn.close()
-
-
-def insert_producto(
-    nombre: str, 
-    categoria: str, 
+            result = await cur.fetchone()
+            if not result:
+                return None
+            producto = _a_producto_row(result)
+            if _CACHE_TTL > 0 and version == _cache_version:
+                _producto_cache[producto_id] = producto.copy()
+            return producto
+
+
+async def insert_producto(
+    nombre: str,
+    categoria: str,
     precio: float,
     stock: int,
     descripcion: str | None = None
@@ -78,28 +190,39 @@ def insert_producto(
     Inserta un nuevo producto en la base de datos.
     Retorna el ID del producto insertado.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cur = conn.cursor()
-        try:
-            cur.execute(
-                """
-                INSERT INTO productos (nombre, categoria, precio, stock, descripcion)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
+    async with get_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                _SQL_INSERT_PRODUCTO,
                 (nombre, categoria, precio, stock, descripcion)
             )
-            conn.commit()
+            _invalidar_caches()
             return cur.lastrowid or 0
-        finally:
-            cur.close()
-    finally:
-        if conn:
-            conn.close()
 
 
-def update_producto(
+async def bulk_insert_productos(productos: List[Dict[str, Any]]) -> int:
+    """
+    Inserta varios productos con un único executemany (una sola conexión).
+    Retorna el número de productos insertados.
+    """
+    if not productos:
+        return 0
+
+    valores = [
+        (p["nombre"], p["categoria"], p["precio"], p["stock"], p.get("descripcion"))
+        for p in productos
+    ]
+    async with get_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.executemany(
+                _SQL_INSERT_PRODUCTO,
+                valores
+            )
+            _invalidar_caches()
+            return cur.rowcount
+
+
+async def update_producto(
     producto_id: int,
     nombre: str,
     categoria: str,
@@ -111,46 +234,30 @@ def update_producto(
     Actualiza los datos de un producto existente.
     Retorna True si se actualizó correctamente, False si no se encontró.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cur = conn.cursor()
-        try:
-            cur.execute(
+    async with get_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
                 """
-                UPDATE productos 
+                UPDATE productos
                 SET nombre = %s, categoria = %s, precio = %s, stock = %s, descripcion = %s
                 WHERE id = %s
                 """,
                 (nombre, categoria, precio, stock, descripcion, producto_id)
             )
-            conn.commit()
+            _invalidar_caches(producto_id)
             return cur.rowcount > 0
-        finally:
-            cur.close()
-    finally:
-        if conn:
-            conn.close()
 
 
-def delete_producto(producto_id: int) -> bool:
+async def delete_producto(producto_id: int) -> bool:
     """
     Elimina un producto de la base de datos por su ID.
     Retorna True si se eliminó correctamente, False si no se encontró.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cur = conn.cursor()
-        try:
-            cur.execute(
+    async with get_connection() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
                 "DELETE FROM productos WHERE id = %s",
                 (producto_id,)
             )
-            conn.commit()
+            _invalidar_caches(producto_id)
             return cur.rowcount > 0
-        finally:
-            cur.close()
-    finally:
-        if conn:
-            conn.close()
@@ -1,12 +1,16 @@
+import os
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import Response
-from pydantic import BaseModel, field_validator
-from typing import Optional, List
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, StringConstraints, field_validator
+from typing import Annotated, Optional, List
 
 # Importamos las funciones que consultan/insertan/eliminan en MySQL
 from app.database import (
-    fetch_all_productos, 
+    init_pool,
+    close_pool,
+    fetch_all_productos_json,
     insert_producto, 
+    bulk_insert_productos,
     delete_producto,
     fetch_producto_by_id,
     update_producto
@@ -17,102 +21,68 @@ from app.database import (
 # MODELOS Pydantic
 # --------------------------------------------------
 
+# Categorías permitidas (se construyen una sola vez al importar el módulo)
+_CATEGORIAS_ORDEN = (
+    'Serum', 'Cleanser', 'Moisturizer', 
+    'Toner', 'Sunscreen', 'Mask', 'Exfoliator',
+    'Eye Cream', 'Ampoule', 'Essence'
+)
+_CATEGORIAS_VALIDAS: frozenset[str] = frozenset(_CATEGORIAS_ORDEN)
+
+# Mensajes de error de los validadores, creados una sola vez
+_ERR_CATEGORIA_VACIA = 'La categoría no puede estar vacía'
+_ERR_CATEGORIA_NO_VALIDA = f'Categoría no válida. Debe ser una de: {", ".join(_CATEGORIAS_ORDEN)}'
+
+
+def _redondear_precio(v: float) -> float:
+    """Redondea el precio a 2 decimales."""
+    return round(v, 2)
+
+
+# Tipos con restricciones evaluadas en pydantic-core (sin validadores Python)
+Nombre = Annotated[str, StringConstraints(min_length=3, max_length=150)]
+Precio = Annotated[float, Field(gt=0, le=999.99), AfterValidator(_redondear_precio)]
+Stock = Annotated[int, Field(ge=0, le=9999)]
+Descripcion = Annotated[str, StringConstraints(max_length=500)]
+
+
 # Modelo base con validaciones comunes
 class ProductoBase(BaseModel):
-    nombre: str
+    # Los espacios de todos los str se recortan en pydantic-core
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
+
+    nombre: Nombre
     categoria: str
-    precio: float
-    stock: int
-    descripcion: Optional[str] = None
+    precio: Precio
+    stock: Stock
+    descripcion: Optional[Descripcion] = None
 
-    @field_validator('nombre')
-    @classmethod
-    def validar_nombre(cls, v: str) -> str:
-        """Valida que el nombre del producto tenga formato correcto."""
-        if not v or not v.strip():
-            raise ValueError('El nombre no puede estar vacío')
-        
-        v = v.strip()
-        
-        if len(v) < 3:
-            raise ValueError('El nombre debe tener al menos 3 caracteres')
-        
-        if len(v) > 150:
-            raise ValueError('El nombre no puede exceder 150 caracteres')
-        
-        return v
-    
     @field_validator('categoria')
     @classmethod
     def validar_categoria(cls, v: str) -> str:
         """Valida que la categoría sea una de las permitidas."""
-        if not v or not v.strip():
-            raise ValueError('La categoría no puede estar vacía')
-        
-        v = v.strip()
-        
-        categorias_validas = [
-            'Serum', 'Cleanser', 'Moisturizer', 
-            'Toner', 'Sunscreen', 'Mask', 'Exfoliator',
-            'Eye Cream', 'Ampoule', 'Essence'
-        ]
+        # Normalizar una sola vez (ignorar mayúsculas)
+        v = v.title()
         
-        # Normalizar para comparar (ignorar mayúsculas)
-        if v.title() not in categorias_validas:
-            raise ValueError(
-                f'Categoría no válida. Debe ser una de: {", ".join(categorias_validas)}'
-            )
-        
-        return v.title()  # Capitaliza la primera letra
-    
-    @field_validator('precio')
-    @classmethod
-    def validar_precio(cls, v: float) -> float:
-        """Valida que el precio tenga formato correcto."""
-        if v <= 0:
-            raise ValueError('El precio debe ser mayor a 0')
+        if not v:
+            raise ValueError(_ERR_CATEGORIA_VACIA)
         
-        if v > 999.99:
-            raise ValueError('El precio no puede exceder 999.99€')
-        
-        # Redondear a 2 decimales
-        return round(v, 2)
-    
-    @field_validator('stock')
-    @classmethod
-    def validar_stock(cls, v: int) -> int:
-        """Valida que el stock sea válido."""
-        if v < 0:
-            raise ValueError('El stock no puede ser negativo')
-        
-        if v > 9999:
-            raise ValueError('El stock no puede exceder 9999 unidades')
+        if v not in _CATEGORIAS_VALIDAS:
+            raise ValueError(_ERR_CATEGORIA_NO_VALIDA)
         
         return v
     
     @field_validator('descripcion')
     @classmethod
     def validar_descripcion(cls, v: Optional[str]) -> Optional[str]:
-        """Valida la descripción del producto."""
-        if v is None or v.strip() == '':
-            return None
-        
-        v = v.strip()
-        
-        if len(v) > 500:
-            raise ValueError('La descripción no puede exceder 500 caracteres')
-        
-        return v
-
-
-# Modelo para crear producto (sin ID)
-class ProductoCreate(ProductoBase):
-    pass
+        """Convierte una descripción vacía en None."""
+        return v or None
 
 
-# Modelo para actualizar producto (sin ID)
-class ProductoUpdate(ProductoBase):
-    pass
+# Crear y actualizar usan los mismos campos que el modelo base (sin ID);
+# se reutiliza la clase para no compilar esquemas idénticos
+ProductoCreate = ProductoBase
+ProductoUpdate = ProductoBase
 
 
 # Modelo completo de Producto (con ID y validaciones)
@@ -120,21 +90,39 @@ class Producto(ProductoBase):
     id: int
 
 
+# Máximo de productos por petición en POST /productos/bulk
+_BULK_MAX_PRODUCTOS = 500
+ProductosBulk = Annotated[List[ProductoCreate], Field(min_length=1, max_length=_BULK_MAX_PRODUCTOS)]
+
+
+# Respuesta de la creación en bloque
+class ResultadoBulk(BaseModel):
+    insertados: int
+
+
 # --------------------------------------------------
 # APP
 # --------------------------------------------------
 
+# Con API_DOCS=false (producción) no se publican /docs, /redoc ni /openapi.json;
+# solo un valor explícitamente falso las desactiva
+_DOCS_ENABLED = os.getenv("API_DOCS", "true").strip().lower() not in ("false", "0", "no", "off")
+
 app = FastAPI(
     title="Glowy API - Skincare Coreano",
     description="API REST para gestión de productos de skincare coreano con SQL directo (sin ORM)",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    openapi_url="/openapi.json" if _DOCS_ENABLED else None,
     contact={
         "name": "Tu nombre",
         "email": "tu-email@example.com"
     }
 )
 
-
+# Pool de conexiones MySQL ligado al ciclo de vida de la app
+app.add_event_handler("startup", init_pool)
+app.add_event_handler("shutdown", close_pool)
 
 # ENDPOINTS
 
@@ -165,21 +153,33 @@ async def favicon():
 
 
 # --- Endpoint para listar todos los productos ---
-@app.get("/productos", response_model=List[Producto], tags=["Productos"])
-def listar_productos():
+@app.get(
+    "/productos",
+    response_model=None,
+    responses={200: {"model": List[Producto]}},
+    tags=["Productos"]
+)
+async def listar_productos():
     """
     Obtiene la lista completa de productos de skincare desde la base de datos.
+    Las filas se devuelven tal cual (sin pasar por jsonable_encoder) y el JSON
+    resultante se reutiliza durante DB_CACHE_TTL segundos.
     
     Returns:
         List[Producto]: Lista de todos los productos
     """
-    rows = fetch_all_productos()
-    return [Producto(**row) for row in rows]
+    contenido = await fetch_all_productos_json()
+    return Response(content=contenido, media_type="application/json")
 
 
 # --- Endpoint para obtener un producto por ID ---
-@app.get("/productos/{producto_id}", response_model=Producto, tags=["Productos"])
-def obtener_producto(producto_id: int):
+@app.get(
+    "/productos/{producto_id}",
+    response_model=None,
+    responses={200: {"model": Producto}},
+    tags=["Productos"]
+)
+async def obtener_producto(producto_id: int):
     """
     Obtiene un producto específico por su ID.
     
@@ -192,17 +192,18 @@ def obtener_producto(producto_id: int):
     Raises:
         HTTPException: 404 si el producto no existe
     """
-    producto = fetch_producto_by_id(producto_id)
+    producto = await fetch_producto_by_id(producto_id)
     
     if not producto:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
     
-    return Producto(**producto)
+    # Los datos ya se validaron al escribirse en la BD
+    return ORJSONResponse(producto)
 
 
 # --- Endpoint para crear un nuevo producto ---
 @app.post("/productos", response_model=Producto, status_code=201, tags=["Productos"])
-def crear_producto(producto: ProductoCreate):
+async def crear_producto(producto: ProductoCreate):
     """
     Crea un nuevo producto en la base de datos.
     Los datos son validados automáticamente por Pydantic.
@@ -213,7 +214,7 @@ def crear_producto(producto: ProductoCreate):
     Returns:
         Producto: Producto creado con su ID asignado
     """
-    producto_id = insert_producto(
+    producto_id = await insert_producto(
         producto.nombre,
         producto.categoria,
         producto.precio,
@@ -221,19 +222,37 @@ def crear_producto(producto: ProductoCreate):
         producto.descripcion
     )
     
-    return Producto(
-        id=producto_id,
-        nombre=producto.nombre,
-        categoria=producto.categoria,
-        precio=producto.precio,
-        stock=producto.stock,
-        descripcion=producto.descripcion
-    )
+    # El body ya fue validado; se responde sin reconstruir Producto
+    return ORJSONResponse({"id": producto_id, **producto.model_dump()}, status_code=201)
+
+
+# --- Endpoint para crear varios productos de una vez ---
+@app.post(
+    "/productos/bulk",
+    status_code=201,
+    response_model=None,
+    responses={201: {"model": ResultadoBulk}},
+    tags=["Productos"]
+)
+async def crear_productos_bulk(productos: ProductosBulk):
+    """
+    Crea varios productos (entre 1 y 500) en una sola operación contra la
+    base de datos. Cada producto es validado por Pydantic antes de insertar ninguno.
+    
+    Args:
+        productos (List[ProductoCreate]): Datos de los productos a crear
+        
+    Returns:
+        ResultadoBulk: Número de productos insertados
+    """
+    insertados = await bulk_insert_productos([p.model_dump() for p in productos])
+    
+    return ORJSONResponse({"insertados": insertados}, status_code=201)
 
 
 # --- Endpoint para actualizar un producto ---
 @app.put("/productos/{producto_id}", response_model=Producto, tags=["Productos"])
-def actualizar_producto(producto_id: int, producto: ProductoUpdate):
+async def actualizar_producto(producto_id: int, producto: ProductoUpdate):
     """
     Actualiza los datos de un producto existente.
     Los datos son validados automáticamente por Pydantic.
@@ -248,7 +267,7 @@ def actualizar_producto(producto_id: int, producto: ProductoUpdate):
     Raises:
         HTTPException: 404 si el producto no existe
     """
-    actualizado = update_producto(
+    actualizado = await update_producto(
         producto_id,
         producto.nombre,
         producto.categoria,
@@ -260,19 +279,18 @@ def actualizar_producto(producto_id: int, producto: ProductoUpdate):
     if not actualizado:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
     
-    return Producto(
-        id=producto_id,
-        nombre=producto.nombre,
-        categoria=producto.categoria,
-        precio=producto.precio,
-        stock=producto.stock,
-        descripcion=producto.descripcion
-    )
+    # El body ya fue validado; se responde sin reconstruir Producto
+    return ORJSONResponse({"id": producto_id, **producto.model_dump()})
 
 
 # --- Endpoint para eliminar un producto ---
-@app.delete("/productos/{producto_id}", status_code=204, tags=["Productos"])
-def eliminar_producto(producto_id: int):
+@app.delete(
+    "/productos/{producto_id}",
+    status_code=204,
+    response_class=Response,
+    tags=["Productos"]
+)
+async def eliminar_producto(producto_id: int):
     """
     Elimina un producto de la base de datos por su ID.
     
@@ -282,9 +300,9 @@ def eliminar_producto(producto_id: int):
     Raises:
         HTTPException: 404 si el producto no existe
     """
-    eliminado = delete_producto(producto_id)
+    eliminado = await delete_producto(producto_id)
     
     if not eliminado:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
     
-    return None
+    return Response(status_code=204)
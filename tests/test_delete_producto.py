@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -5,9 +6,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.database import delete_producto
+from app.database import delete_producto, close_pool
 
-if __name__ == "__main__":
+
+async def main():
     try:
         # Validar que se haya pasado el ID como parámetro
         if len(sys.argv) < 2:
@@ -17,7 +19,7 @@ if __name__ == "__main__":
         
         # Obtener el ID del producto desde los argumentos
         producto_id = int(sys.argv[1])
-        resultado = delete_producto(producto_id)
+        resultado = await delete_producto(producto_id)
 
         if resultado:
             print(f'Producto {producto_id} eliminado correctamente →', resultado)
@@ -28,6 +30,12 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print('Error al eliminar producto →', e)
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
 
 # ===== EJECUCIÓN DESDE CMD =====
 # python3 tests/test_delete_producto.py 11
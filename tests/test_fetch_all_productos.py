@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -5,16 +6,23 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.database import fetch_all_productos
+from app.database import fetch_all_productos, close_pool
 
-if __name__ == "__main__":
+
+async def main():
     try:
-        productos = fetch_all_productos()
+        productos = await fetch_all_productos()
         print(f'Productos encontrados: {len(productos)}')
         for p in productos:
             print(p)
     except Exception as e:
         print('Error al obtener productos →', e)
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
 
 # ===== EJECUCIÓN DESDE CMD =====
 # python3 tests/test_fetch_all_productos.py
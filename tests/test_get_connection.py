@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -5,18 +6,23 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.database import get_connection
+from app.database import get_connection, close_pool
 
-if __name__ == "__main__":
+
+async def main():
     try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute('SELECT 1')
-        print('Conexión OK →', cur.fetchone())
-        cur.close()
-        conn.close()
+        async with get_connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute('SELECT 1')
+                print('Conexión OK →', await cur.fetchone())
     except Exception as e:
         print('Error de conexión →', e)
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
 
 # ===== EJECUCIÓN DESDE CMD =====
 # python3 tests/test_get_connection.py
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 from pathlib import Path
 
@@ -5,11 +6,12 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from app.database import insert_producto
+from app.database import insert_producto, bulk_insert_productos, close_pool
 
-if __name__ == "__main__":
+
+async def main():
     try:
-        nuevo_id = insert_producto(
+        nuevo_id = await insert_producto(
             nombre='COSRX Advanced Snail 92 All In One Cream',
             categoria='Moisturizer',
             precio=28.50,
@@ -18,8 +20,33 @@ if __name__ == "__main__":
         )
 
         print('ID producto insertado →', nuevo_id)
+
+        insertados = await bulk_insert_productos([
+            {
+                'nombre': 'Anua Heartleaf 77% Soothing Toner',
+                'categoria': 'Toner',
+                'precio': 21.00,
+                'stock': 40,
+                'descripcion': 'Tónico calmante con extracto de heartleaf'
+            },
+            {
+                'nombre': 'Round Lab Birch Juice Moisturizing Sunscreen',
+                'categoria': 'Sunscreen',
+                'precio': 19.50,
+                'stock': 55,
+                'descripcion': None
+            }
+        ])
+
+        print('Productos insertados en bloque →', insertados)
     except Exception as e:
         print('Error al insertar producto →', e)
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
 
 # ===== EJECUCIÓN DESDE CMD =====
 # python3 tests/test_insert_producto.py